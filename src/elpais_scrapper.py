@@ -10,7 +10,10 @@ from selenium import webdriver
 
 from pages.home_page import HomePage
 from pages.opinion_page import OpinionPage
+from utils.deduplicator import Deduplicator
 from utils.logger import Logger
+from utils.section_cache import SectionCache
+from utils.session_state import SessionState
 from utils.translator import Translator
 
 MAX_ARTICLE_TO_SCRAPE = 5
@@ -21,10 +24,11 @@ def scrape_elpais():
 
     driver = webdriver.Chrome()
     translator = Translator()
+    deduplicator = Deduplicator()
 
     try:
-        logger.info("Navigating to home page and ensuring Spanish language")
-        home_page = HomePage(driver)
+        logger.info("Navigating to home page (or cached Opinion section) and ensuring Spanish language")
+        home_page = HomePage(driver, SessionState(driver), SectionCache())
         home_page.handle_cookie_popup()
         home_page.ensure_spanish_language()
         home_page.go_to_opinion_section()
@@ -41,24 +45,46 @@ def scrape_elpais():
             articles = opinion_page.get_articles(2 * MAX_ARTICLE_TO_SCRAPE)
             articles_scrapped = 0
             # Process each article
-            for i, article in enumerate(articles, 1):
+            for article in articles:
                 title = article.get_title()
                 content = article.get_content()
 
                 logger.debug(f"Title (Spanish): {title}")
                 logger.debug(f"Content (Spanish): {content}")
 
-                if article.download_image(f"{IMAGE_DOWNLOAD_LOCATION}article_{i}_image.jpg"):
-                    logger.info(f"Image for article [{title}] saved as article_{i}_image.jpg")
+                signature = deduplicator.signature(title, content)
+                duplicate = deduplicator.find_duplicate(signature)
+                if duplicate and duplicate['translation']:
+                    # Near-duplicate of an already processed article, skip image download and translation
+                    logger.info(f"Article [{title}] is a near-duplicate of [{duplicate['title']}], "
+                                f"reusing previous results")
+                    if duplicate['image'] and os.path.exists(duplicate['image']):
+                        logger.info(f"Image for article [{title}] already saved as {duplicate['image']}")
+                    else:
+                        image_file = duplicate['image'] or \
+                            f"{IMAGE_DOWNLOAD_LOCATION}{deduplicator.fingerprint(signature)}.jpg"
+                        if article.download_image(image_file):
+                            logger.info(f"Image for article [{title}] saved as {image_file}")
+                            deduplicator.update_image(duplicate['id'], image_file)
+                    translated_title = duplicate['translation']
+                    logger.debug(f"Title (English): {translated_title}")
+                    translated_titles.append(translated_title)
                 else:
-                    logger.info(f"No image available for [{title}] article")
-
-                translated_title = translator.translate(title)
-                logger.debug(f"Title (English): {translated_title}")
-
-                translated_titles.append(translated_title)
-                logger.debug('Add a delay to avoid overwhelming the API')
-                time.sleep(1)
+                    # Name the image after the signature so the path stored in the index stays valid across runs
+                    image_file = f"{IMAGE_DOWNLOAD_LOCATION}{deduplicator.fingerprint(signature)}.jpg"
+                    if article.download_image(image_file):
+                        logger.info(f"Image for article [{title}] saved as {image_file}")
+                    else:
+                        logger.info(f"No image available for [{title}] article")
+                        image_file = None
+
+                    translated_title = translator.translate(title)
+                    logger.debug(f"Title (English): {translated_title}")
+                    deduplicator.add(signature, title, translated_title, image_file)
+
+                    translated_titles.append(translated_title)
+                    logger.debug('Add a delay to avoid overwhelming the API')
+                    time.sleep(1)
                 articles_scrapped += 1
                 if articles_scrapped >= MAX_ARTICLE_TO_SCRAPE:
                     logger.info(f"Reached the maximum number of articles to scrape: {MAX_ARTICLE_TO_SCRAPE}")
@@ -91,6 +117,7 @@ def scrape_elpais():
 
     finally:
         driver.quit()
+        deduplicator.close()
 
 if __name__ == "__main__":
     scrape_elpais()
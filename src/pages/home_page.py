@@ -1,5 +1,7 @@
 import time
+from urllib.parse import urlsplit, urlunsplit
 
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
@@ -14,6 +16,7 @@ class HomePage(BasePage):
 
     This class provides methods to interact with various elements on the El País homepage,
     including language selection, navigation to different sections, and handling cookie popups.
+    When the Opinion section URL is cached, the section is opened directly instead of the homepage.
 
     Attributes:
         URL (str): The base URL for El País website
@@ -21,7 +24,9 @@ class HomePage(BasePage):
         LANGUAGE_DROPDOWN (tuple): Locator for the language dropdown menu
         SPANISH_OPTION (tuple): Locator for the Spanish language option
         OPINION_LINK (tuple): Locator for the Opinion section link
+        OPINION_PATH (str): URL path identifying the Opinion section
         AGREE_BUTTON (tuple): Locator for the cookie consent button
+        RESTORED_CONSENT_TIMEOUT (int): Time to wait for the cookie popup when a restored consent is missing
     """
 
     URL = "https://elpais.com/"
@@ -29,22 +34,68 @@ class HomePage(BasePage):
     LANGUAGE_DROPDOWN = (By.XPATH, "//li[@id='edition_head']")
     SPANISH_OPTION = (By.XPATH, "//a[contains(@href, 'elpais.com/')]")
     SELECTED_LANGUAGE = (By.XPATH, "//li[@class='ed_c']")
-    OPINION_LINK = (By.XPATH, "//*[@id='hamburger_container']//a[contains(@href, '/opinion/')]")
+    OPINION_PATH = '/opinion/'
+    OPINION_LINK = (By.XPATH, f"//*[@id='hamburger_container']//a[contains(@href, '{OPINION_PATH}')]")
     AGREE_BUTTON_BROWSER = (By.ID, "didomi-notice-agree-button")  # browser only
     AGREE_BUTTON_IOS = (By.CLASS_NAME, "pmConsentWall-button")
     MENU_BUTTON_OPEN = (By.ID, "btn_open_hamburger")
     MENU_BUTTON_CLOSE = (By.ID, "btn_toggle_hamburger")
+    RESTORED_CONSENT_TIMEOUT = 3
 
-    def __init__(self, driver):
+    def __init__(self, driver, session_state=None, section_cache=None):
         """
         Initialize the HomePage with a WebDriver instance and navigate to the homepage.
 
+        If a session state is given, the saved cookies and local storage are restored before
+        navigating, so that an already given cookie consent is applied on the first render.
+        If the Opinion section URL is cached, it is opened instead of the homepage, which is
+        only loaded when the cached URL fails.
+
         Args:
             driver: The Selenium WebDriver instance
+            session_state (SessionState, optional): Persisted session state to restore and save. Defaults to None
+            section_cache (SectionCache, optional): Cache of resolved section URLs. Defaults to None
         """
         super().__init__(driver)
         self.logger = Logger(__name__)
-        self.driver.get(self.URL)
+        self.session_state = session_state
+        self.section_cache = section_cache
+        self.session_restored = session_state is not None and session_state.restore(self.URL)
+        self.on_opinion_section = self._open_cached_opinion_section()
+        if not self.on_opinion_section:
+            self.driver.get(self.URL)
+
+    def _open_cached_opinion_section(self):
+        """
+        Navigate directly to the cached Opinion section URL and check the page identity.
+
+        Returns:
+            bool: True if the Opinion section in Spanish is displayed, False if the URL is not
+                  cached or the cached URL failed, in which case it is removed from the cache
+        """
+        cached_url = self.section_cache.get('opinion') if self.section_cache is not None else None
+        if not cached_url:
+            return False
+
+        self.logger.debug(f"Navigating to Opinion section using cached URL {cached_url}")
+        try:
+            self.driver.get(cached_url)
+            if self.OPINION_PATH in self.driver.current_url and self.get_language() == 'es-ES':
+                return True
+            self.logger.debug(f"Cached URL led to [{self.driver.current_url}], falling back to the menu")
+        except WebDriverException as e:
+            self.logger.debug(f"Failed to open cached URL {cached_url}, falling back to the menu: {str(e)}")
+        self.section_cache.invalidate('opinion')
+        return False
+
+    def get_language(self):
+        """
+        Get the language of the currently displayed page.
+
+        Returns:
+            str: The value of the 'lang' attribute of the html element, e.g. 'es-ES'
+        """
+        return self.driver.find_element(By.XPATH, "//html").get_attribute('lang')
 
     def ensure_spanish_language(self):
         """
@@ -57,16 +108,21 @@ class HomePage(BasePage):
             AssertionError: If the webpage is not in Spanish language
         """
         self.logger.debug('Ensure the website is in Spanish')
-        language = self.driver.find_element(By.XPATH, "//html").get_attribute('lang')
+        language = self.get_language()
         assert language == 'es-ES', f"Webpage loaded in [{language}]"
 
     def go_to_opinion_section(self):
         """
         Navigate to the Opinion section of the website.
 
-        This method clicks on the Opinion section link and waits for the navigation
-        to complete.
+        If the section was already opened from its cached URL, there is nothing to do. Otherwise
+        this method clicks on the Opinion section link from the hamburger menu, waits for the
+        navigation to complete and caches the resolved URL, without its query string and fragment.
         """
+        if self.on_opinion_section:
+            self.logger.debug("Already on Opinion section")
+            return
+
         self.logger.debug("Navigating to Opinion section")
         self.wait_and_click(self.MENU_BUTTON_OPEN)
 
@@ -75,21 +131,58 @@ class HomePage(BasePage):
         # device orientation changed to landscape
         self.driver.execute_script("arguments[0].scrollIntoView();", options_link)
         self.wait_and_click(self.OPINION_LINK)
+        if self.section_cache is not None:
+            try:
+                WebDriverWait(self.driver, 10).until(ec.url_contains(self.OPINION_PATH))
+            except TimeoutException:
+                self.logger.warning(f"Opinion section URL not resolved from [{self.driver.current_url}], not caching it")
+                return
+            scheme, host, path, _, _ = urlsplit(self.driver.current_url)
+            self.section_cache.set('opinion', urlunsplit((scheme, host, path, '', '')))
 
     def handle_cookie_popup(self):
         """
         Handle the cookie consent popup by accepting it.
 
-        This method waits for the cookie popup to appear and clicks the accept button.
-        If the popup doesn't appear within 30 seconds, it will raise a TimeoutException.
+        This method waits for the cookie popup to appear and clicks the accept button, then saves
+        the session state so that following runs skip the popup. If a saved session state was
+        restored and its consent is present on the page, the popup is skipped. If the restored
+        consent is missing, the popup is waited for a shorter time and only clicked if it is shown.
 
         Raises:
             TimeoutException: If the cookie popup doesn't appear within the timeout period
         """
         try:
+            if self.session_restored and self.session_state.has_consent():
+                self.logger.debug("Cookie consent restored from session state, skipping the pop-up")
+                return
+
+            snapshot = self.session_state.snapshot() if self.session_state is not None else None
             self.logger.debug("Wait for the cookie pop-up to appear and find the accept button")
-            accept_button = self.wait_for_presence_any(locator_list=[self.AGREE_BUTTON_IOS, self.AGREE_BUTTON_BROWSER], timeout=10)
+            timeout = self.RESTORED_CONSENT_TIMEOUT if self.session_restored else 10
+            accept_button = self.wait_for_presence_any(locator_list=[self.AGREE_BUTTON_IOS, self.AGREE_BUTTON_BROWSER], timeout=timeout)
+            if self.session_restored and accept_button is None:
+                self.logger.debug("Cookie pop-up not shown with restored session state")
+                return
             accept_button.click()
+            if self.session_state is not None:
+                self._save_session_state(accept_button, snapshot)
         except Exception as e:
             self.logger.debug(f"Error handling cookie popup: {str(e)}")
             raise
+
+    def _save_session_state(self, accept_button, snapshot):
+        """
+        Save the session state once the consent management platform has stored the consent.
+
+        Saving the session state is only a cache, so failures are logged and ignored.
+
+        Args:
+            accept_button (WebElement): The clicked cookie consent button
+            snapshot (dict): Snapshot of the session state taken before accepting the consent
+        """
+        try:
+            WebDriverWait(self.driver, 10).until(ec.invisibility_of_element(accept_button))
+            self.session_state.save(snapshot)
+        except Exception as e:
+            self.logger.warning(f"Failed to save session state after accepting cookies: {str(e)}")
@@ -0,0 +1,280 @@
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import time
+
+from utils.logger import Logger
+
+
+class Deduplicator:
+    """
+    A class that detects near-duplicate articles using MinHash signatures and an LSH index.
+
+    Each article (title + content) is reduced to a set of word and word bigram shingles, and
+    to a MinHash signature of NUM_PERM values estimating the Jaccard similarity of those sets.
+    The signature is split into BANDS bands of ROWS values, each hashed into a key of a locality
+    sensitive hashing (LSH) index. A lookup only compares the new signature against the stored
+    articles sharing at least one band key, which are almost only its near-duplicates.
+
+    With 32 bands of 4 rows, an article with a Jaccard similarity of 0.6 is found with a
+    probability of ~99%, 0.7 with ~99.98%, while unrelated articles (similarity below 0.15) are
+    almost never fetched as candidates. On title + teaser texts of 30-40 words, up to three word
+    edits keep a similarity above 0.7, while unrelated articles on the same topic stay below 0.15.
+
+    The index is stored in an SQLite database, so lookups only read the candidate buckets instead
+    of loading the whole archive, and concurrent scraper processes (one per BrowserStack platform)
+    can safely share it. Entries older than max_age, and their images, are removed when opening it.
+
+    Attributes:
+        NUM_PERM (int): Number of values in a MinHash signature
+        BANDS (int): Number of bands the signature is split into for the LSH index
+        ROWS (int): Number of signature values per band
+        DEFAULT_THRESHOLD (float): Default minimum estimated Jaccard similarity of duplicates
+        DEFAULT_INDEX_FILE (str): Default location of the index database
+        DEFAULT_MAX_AGE (int): Default lifetime of an index entry in seconds
+    """
+
+    NUM_PERM = 128
+    BANDS = 32
+    ROWS = 4
+    DEFAULT_THRESHOLD = 0.6
+    DEFAULT_INDEX_FILE = 'data' + os.sep + 'dedup_index.sqlite3'
+    DEFAULT_MAX_AGE = 180 * 24 * 60 * 60
+    _PRIME = (1 << 61) - 1
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL,
+            title TEXT,
+            translation TEXT,
+            image TEXT,
+            added_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS articles_added_at ON articles (added_at);
+        CREATE TABLE IF NOT EXISTS bands (
+            key INTEGER NOT NULL,
+            article_id INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS bands_key ON bands (key);
+        CREATE INDEX IF NOT EXISTS bands_article_id ON bands (article_id);
+    """
+
+    def __init__(self, index_file=DEFAULT_INDEX_FILE, threshold=DEFAULT_THRESHOLD, max_age=DEFAULT_MAX_AGE):
+        """
+        Initialize the Deduplicator, open the index database and remove expired entries.
+
+        Failing to open the index is only logged, duplicates are then never found.
+
+        Args:
+            index_file (str, optional): Path of the index database. Defaults to 'data/dedup_index.sqlite3'
+            threshold (float, optional): Minimum estimated Jaccard similarity between two articles
+                for them to be considered duplicates. Defaults to 0.6
+            max_age (int, optional): Lifetime of an index entry in seconds. Defaults to 180 days
+        """
+        self.logger = Logger(__name__)
+        self.index_file = index_file
+        self.threshold = threshold
+        self.max_age = max_age
+        self.permutations = [(self._hash(f'a{i}') % (self._PRIME - 1) + 1, self._hash(f'b{i}') % self._PRIME)
+                             for i in range(self.NUM_PERM)]
+        self.connection = None
+        try:
+            index_dir = os.path.dirname(index_file)
+            if index_dir:
+                os.makedirs(index_dir, exist_ok=True)
+            self.connection = sqlite3.connect(index_file, timeout=30)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.executescript(self._SCHEMA)
+            self._expire()
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f'Failed to open dedup index {index_file}: {str(e)}')
+            self.close()
+
+    @staticmethod
+    def _hash(value):
+        """
+        Hash a string into a stable 64-bit integer.
+
+        Python's built-in hash() is salted per process, so a digest is used to keep
+        signatures comparable across runs.
+
+        Args:
+            value (str): The string to hash
+
+        Returns:
+            int: The hash
+        """
+        return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    @staticmethod
+    def _shingles(text):
+        """
+        Split text into the set of lowercase words and word bigrams compared by the Jaccard similarity.
+
+        Args:
+            text (str): The text to split
+
+        Returns:
+            set[str]: The shingles of the text
+        """
+        words = re.findall(r'\w+', text.lower())
+        return set(words) | {' '.join(pair) for pair in zip(words, words[1:])}
+
+    def signature(self, title, content=''):
+        """
+        Compute the MinHash signature of an article.
+
+        Args:
+            title (str): The article title
+            content (str, optional): The article content. Defaults to ''
+
+        Returns:
+            tuple[int]: The NUM_PERM 32-bit MinHash values
+        """
+        hashes = [self._hash(shingle) for shingle in self._shingles(f"{title} {content}")] or [0]
+        return tuple(min((a * value + b) % self._PRIME for value in hashes) & 0xffffffff
+                     for a, b in self.permutations)
+
+    def fingerprint(self, signature):
+        """
+        Get a short stable identifier of a signature, e.g. to name files after an article.
+
+        Args:
+            signature (tuple[int]): The MinHash signature
+
+        Returns:
+            str: 16 hexadecimal characters identifying the signature
+        """
+        return hashlib.blake2b(self._pack(signature), digest_size=8).hexdigest()
+
+    def _pack(self, signature):
+        """
+        Serialize a signature to bytes.
+
+        Args:
+            signature (tuple[int]): The MinHash signature
+
+        Returns:
+            bytes: The serialized signature
+        """
+        return struct.pack(f'>{self.NUM_PERM}I', *signature)
+
+    def _band_keys(self, signature):
+        """
+        Hash each band of a signature into a key of the LSH index.
+
+        Args:
+            signature (tuple[int]): The MinHash signature
+
+        Returns:
+            list[int]: One signed 64-bit key per band
+        """
+        keys = []
+        for band in range(self.BANDS):
+            values = signature[band * self.ROWS:(band + 1) * self.ROWS]
+            digest = hashlib.blake2b(struct.pack(f'>{self.ROWS + 1}I', band, *values), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, 'big', signed=True))
+        return keys
+
+    def find_duplicate(self, signature):
+        """
+        Look up a previously seen article similar to the given signature.
+
+        Args:
+            signature (tuple[int]): The MinHash signature of the article
+
+        Returns:
+            dict: The closest duplicate (id, title, translation, image, similarity), or None if
+                  no stored article reaches the similarity threshold
+        """
+        if self.connection is None:
+            return None
+        keys = self._band_keys(signature)
+        try:
+            rows = self.connection.execute(
+                'SELECT id, signature, title, translation, image FROM articles WHERE id IN '
+                f'(SELECT article_id FROM bands WHERE key IN ({", ".join("?" * len(keys))}))', keys).fetchall()
+        except sqlite3.Error as e:
+            self.logger.warning(f'Failed to query dedup index {self.index_file}: {str(e)}')
+            return None
+
+        best, best_similarity = None, self.threshold
+        for entry_id, stored, title, translation, image in rows:
+            stored = struct.unpack(f'>{self.NUM_PERM}I', stored)
+            similarity = sum(a == b for a, b in zip(signature, stored)) / self.NUM_PERM
+            if similarity >= best_similarity:
+                best, best_similarity = (entry_id, title, translation, image), similarity
+
+        if best is None:
+            return None
+        entry_id, title, translation, image = best
+        self.logger.debug(f'Found duplicate of [{title}] with similarity {best_similarity:.2f}')
+        return {'id': entry_id, 'title': title, 'translation': translation, 'image': image,
+                'similarity': best_similarity}
+
+    def add(self, signature, title, translation, image=None):
+        """
+        Add an article and its computed results to the index.
+
+        Args:
+            signature (tuple[int]): The MinHash signature of the article
+            title (str): The original article title
+            translation (str): The translated title
+            image (str, optional): Path of the downloaded image. Defaults to None
+        """
+        if self.connection is None:
+            return
+        try:
+            with self.connection:
+                cursor = self.connection.execute(
+                    'INSERT INTO articles (signature, title, translation, image, added_at) VALUES (?, ?, ?, ?, ?)',
+                    (self._pack(signature), title, translation, image, time.time()))
+                self.connection.executemany('INSERT INTO bands (key, article_id) VALUES (?, ?)',
+                                            [(key, cursor.lastrowid) for key in self._band_keys(signature)])
+        except sqlite3.Error as e:
+            self.logger.warning(f'Failed to add [{title}] to dedup index {self.index_file}: {str(e)}')
+
+    def update_image(self, entry_id, image):
+        """
+        Update the image path of an article of the index.
+
+        Args:
+            entry_id (int): The id of the article, as returned by find_duplicate()
+            image (str): Path of the downloaded image
+        """
+        if self.connection is None:
+            return
+        try:
+            with self.connection:
+                self.connection.execute('UPDATE articles SET image = ? WHERE id = ?', (image, entry_id))
+        except sqlite3.Error as e:
+            self.logger.warning(f'Failed to update image in dedup index {self.index_file}: {str(e)}')
+
+    def _expire(self):
+        """
+        Remove the entries older than max_age and delete their images.
+        """
+        oldest = time.time() - self.max_age
+        expired = self.connection.execute('SELECT id, image FROM articles WHERE added_at < ?', (oldest,)).fetchall()
+        if not expired:
+            return
+        with self.connection:
+            self.connection.executemany('DELETE FROM bands WHERE article_id = ?', [(row[0],) for row in expired])
+            self.connection.executemany('DELETE FROM articles WHERE id = ?', [(row[0],) for row in expired])
+        for _, image in expired:
+            if image and os.path.exists(image):
+                try:
+                    os.remove(image)
+                except OSError as e:
+                    self.logger.warning(f'Failed to delete expired image {image}: {str(e)}')
+        self.logger.debug(f'Removed {len(expired)} expired entries from {self.index_file}')
+
+    def close(self):
+        """
+        Close the index database.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
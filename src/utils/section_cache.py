@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import time
+
+from utils.logger import Logger
+
+
+class SectionCache:
+    """
+    A class that caches resolved section URLs so sections can be opened directly.
+
+    Section URLs are learned once from the site navigation menu and persisted to a JSON file.
+    A cached URL is considered stale after the refresh interval, so it is periodically
+    re-learned from the menu in case the site structure changes.
+
+    Attributes:
+        DEFAULT_CACHE_FILE (str): Default location of the persisted cache
+        DEFAULT_REFRESH_INTERVAL (int): Default lifetime of a cached URL in seconds
+    """
+
+    DEFAULT_CACHE_FILE = 'data' + os.sep + 'section_urls.json'
+    DEFAULT_REFRESH_INTERVAL = 24 * 60 * 60
+
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE, refresh_interval=DEFAULT_REFRESH_INTERVAL):
+        """
+        Initialize the SectionCache and load the persisted cache if it exists.
+
+        Args:
+            cache_file (str, optional): Path of the persisted cache. Defaults to 'data/section_urls.json'
+            refresh_interval (int, optional): Lifetime of a cached URL in seconds. Defaults to 1 day
+        """
+        self.logger = Logger(__name__)
+        self.cache_file = cache_file
+        self.refresh_interval = refresh_interval
+        self.sections = {}
+        self._load()
+
+    def _load(self):
+        """
+        Load the persisted cache.
+        """
+        if not os.path.exists(self.cache_file):
+            self.logger.debug(f'No section cache found at {self.cache_file}, starting empty')
+            return
+        try:
+            with open(self.cache_file, encoding='utf-8') as handler:
+                self.sections = json.load(handler)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f'Failed to load section cache {self.cache_file}: {str(e)}')
+
+    def _save(self):
+        """
+        Persist the cache to disk. Failing to write the cache is only logged.
+
+        Several scraper processes may share the same cache (one per BrowserStack platform), so it is
+        written through a per-process temporary file and atomically replaced, never read half written.
+        """
+        cache_dir = os.path.dirname(self.cache_file) or '.'
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir, suffix='.tmp',
+                                             delete=False) as handler:
+                json.dump(self.sections, handler, ensure_ascii=False)
+            os.replace(handler.name, self.cache_file)
+        except OSError as e:
+            self.logger.warning(f'Failed to save section cache {self.cache_file}: {str(e)}')
+
+    def get(self, section):
+        """
+        Get the cached URL of a section.
+
+        Args:
+            section (str): The section name, e.g. 'opinion'
+
+        Returns:
+            str: The cached URL, or None if the section is not cached or its URL is stale
+        """
+        entry = self.sections.get(section)
+        if entry is None:
+            return None
+        if time.time() - entry['resolved_at'] > self.refresh_interval:
+            self.logger.debug(f'Cached URL of section [{section}] is stale, it will be refreshed')
+            return None
+        return entry['url']
+
+    def set(self, section, url):
+        """
+        Cache the resolved URL of a section.
+
+        Args:
+            section (str): The section name, e.g. 'opinion'
+            url (str): The resolved section URL
+        """
+        self.logger.debug(f'Caching URL of section [{section}]: {url}')
+        self.sections[section] = {'url': url, 'resolved_at': time.time()}
+        self._save()
+
+    def invalidate(self, section):
+        """
+        Remove the cached URL of a section.
+
+        Args:
+            section (str): The section name, e.g. 'opinion'
+        """
+        if self.sections.pop(section, None) is not None:
+            self._save()
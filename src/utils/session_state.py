@@ -0,0 +1,259 @@
+import json
+import os
+import re
+import time
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.logger import Logger
+
+
+class SessionState:
+    """
+    A class that persists browser session state (cookies and local storage) across runs.
+
+    Once the cookie consent has been accepted, the session state is saved per platform so
+    that following runs on the same platform can restore it and skip the consent wall.
+    The consent cookies and local storage keys are recorded with the state, and the state
+    expires as soon as one of the consent cookies expires, regardless of other cookies.
+    The platform key is built from the same fields used for platforms in browserstack.yml
+    (deviceName, os, osVersion, browserName, browserVersion), read from the 'bstack:options'
+    capabilities. Remote sessions usually do not return 'bstack:options', so the key falls back
+    to the returned W3C capabilities (platformName, browserName, browserVersion, appium:deviceName).
+
+    Attributes:
+        CONSENT_KEYS (tuple): Known cookie and local storage names holding the consent (Didomi)
+        PLATFORM_FIELDS (tuple): Capability names used to build the platform key
+        BOOTSTRAP_PATH (str): Lightweight same-origin path loaded before restoring the state
+        DEFAULT_STATE_DIR (str): Default directory of the persisted session states
+        DEFAULT_MAX_AGE (int): Default lifetime of a saved session state in seconds
+    """
+
+    CONSENT_KEYS = ('didomi_token', 'euconsent-v2')
+    PLATFORM_FIELDS = ('deviceName', 'os', 'osVersion', 'browserName', 'browserVersion')
+    BOOTSTRAP_PATH = '/robots.txt'
+    DEFAULT_STATE_DIR = 'data' + os.sep + 'session_state'
+    DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+
+    def __init__(self, driver, state_dir=DEFAULT_STATE_DIR, max_age=DEFAULT_MAX_AGE):
+        """
+        Initialize the SessionState for the platform the driver is running on.
+
+        Args:
+            driver: The Selenium WebDriver instance
+            state_dir (str, optional): Directory of the persisted session states. Defaults to 'data/session_state'
+            max_age (int, optional): Lifetime of a saved session state in seconds. Defaults to 7 days
+        """
+        self.driver = driver
+        self.logger = Logger(__name__)
+        self.max_age = max_age
+        self.platform = self._platform_key()
+        self.state_file = os.path.join(state_dir, f'{self.platform}.json')
+        self.consent_cookies = []
+        self.consent_storage_keys = []
+
+    def _platform_key(self):
+        """
+        Build a file name safe key identifying the platform from the driver capabilities.
+
+        Returns:
+            str: The platform key, e.g. 'windows_10_chrome_120_0' or 'iphone_13_15_safari'
+        """
+        capabilities = dict(self.driver.capabilities)
+        capabilities.update(capabilities.get('bstack:options', {}))
+        if 'os' not in capabilities and 'platformName' in capabilities:
+            capabilities['os'] = capabilities['platformName']
+        if 'deviceName' not in capabilities and 'appium:deviceName' in capabilities:
+            capabilities['deviceName'] = capabilities['appium:deviceName']
+
+        values = [str(capabilities[field]) for field in self.PLATFORM_FIELDS if capabilities.get(field)]
+        return re.sub(r'\W+', '_', '_'.join(values).lower()).strip('_') or 'default'
+
+    def _load(self):
+        """
+        Load the saved session state, discarding it if it has expired.
+
+        Returns:
+            dict: The saved state with its non expired cookies, or None if there is no valid state
+        """
+        if not os.path.exists(self.state_file):
+            self.logger.debug(f'No session state saved for platform [{self.platform}]')
+            return None
+        try:
+            with open(self.state_file, encoding='utf-8') as handler:
+                state = json.load(handler)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f'Failed to load session state {self.state_file}: {str(e)}')
+            return None
+
+        now = time.time()
+        if now - state.get('saved_at', 0) > self.max_age:
+            self.logger.debug(f'Session state for platform [{self.platform}] is older than {self.max_age}s')
+            self.clear()
+            return None
+        state['cookies'] = [cookie for cookie in state.get('cookies', [])
+                            if cookie.get('expiry') is None or cookie['expiry'] > now]
+        cookie_names = {cookie['name'] for cookie in state['cookies']}
+        consent_cookies = state.get('consent_cookies', [])
+        consent_storage_keys = state.get('consent_storage_keys', [])
+        if not consent_cookies and not consent_storage_keys:
+            self.logger.debug(f'Session state for platform [{self.platform}] holds no consent')
+            self.clear()
+            return None
+        if not cookie_names.issuperset(consent_cookies):
+            self.logger.debug(f'Consent cookies saved for platform [{self.platform}] have expired')
+            self.clear()
+            return None
+        return state
+
+    def _read_current(self):
+        """
+        Read the cookies and local storage of the current page.
+
+        Returns:
+            tuple: The list of cookies and the local storage dictionary
+        """
+        cookies = self.driver.get_cookies()
+        local_storage = self.driver.execute_script("return Object.assign({}, window.localStorage);") or {}
+        return cookies, local_storage
+
+    def snapshot(self):
+        """
+        Take a snapshot of the cookie names and local storage keys of the current page.
+
+        Taken before accepting the consent, it allows save() to detect which cookies and keys
+        were written by the consent management platform.
+
+        Returns:
+            dict: The cookie names and local storage keys, or None if they could not be read
+        """
+        try:
+            cookies, local_storage = self._read_current()
+        except WebDriverException as e:
+            self.logger.debug(f'Failed to take session state snapshot: {str(e)}')
+            return None
+        return {'cookies': [cookie['name'] for cookie in cookies], 'local_storage': list(local_storage)}
+
+    def has_consent(self):
+        """
+        Check that the consent restored from the saved state is present on the current page.
+
+        Returns:
+            bool: True if all consent cookies and local storage keys of the restored state are present
+        """
+        if not self.consent_cookies and not self.consent_storage_keys:
+            return False
+        try:
+            cookies, local_storage = self._read_current()
+        except WebDriverException as e:
+            self.logger.debug(f'Failed to read restored consent: {str(e)}')
+            return False
+        return ({cookie['name'] for cookie in cookies}.issuperset(self.consent_cookies)
+                and set(local_storage).issuperset(self.consent_storage_keys))
+
+    def restore(self, url):
+        """
+        Restore the saved session state for the origin of the given url.
+
+        Cookies and local storage can only be set on a page of their own origin, so a lightweight
+        page of that origin is loaded first. The caller is expected to navigate to the actual url
+        afterwards, which then renders with the restored state.
+
+        Args:
+            url (str): The url the session state is restored for
+
+        Returns:
+            bool: True if a valid session state was restored, False otherwise
+        """
+        state = self._load()
+        if state is None:
+            return False
+
+        self.logger.debug(f'Restoring session state for platform [{self.platform}]')
+        self.consent_cookies = state.get('consent_cookies', [])
+        self.consent_storage_keys = state.get('consent_storage_keys', [])
+        try:
+            self.driver.get(urljoin(url, self.BOOTSTRAP_PATH))
+            for cookie in state['cookies']:
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception as e:
+                    self.logger.debug(f"Failed to restore cookie [{cookie.get('name')}]: {str(e)}")
+            self.driver.execute_script(
+                "for (const [key, value] of Object.entries(arguments[0])) { window.localStorage.setItem(key, value); }",
+                state.get('local_storage', {}))
+        except WebDriverException as e:
+            self.logger.warning(f'Failed to restore session state for platform [{self.platform}]: {str(e)}')
+            self.consent_cookies = []
+            self.consent_storage_keys = []
+            self.clear()
+            return False
+        return True
+
+    def save(self, snapshot=None):
+        """
+        Save the cookies and local storage of the current page for the platform.
+
+        The consent is identified by the known CONSENT_KEYS or, if none of them is present, by the
+        cookies and local storage keys added since the snapshot taken before accepting the consent.
+        A state holding no consent is not saved. Failing to write the state is only logged, as it is
+        a cache.
+
+        Args:
+            snapshot (dict, optional): Snapshot taken before accepting the consent. Defaults to None
+
+        Returns:
+            bool: True if the session state was saved, False otherwise
+        """
+        cookies, local_storage = self._read_current()
+        consent_cookies = self._consent_names([cookie['name'] for cookie in cookies],
+                                              snapshot['cookies'] if snapshot else None)
+        consent_storage_keys = self._consent_names(list(local_storage),
+                                                   snapshot['local_storage'] if snapshot else None)
+        if not consent_cookies and not consent_storage_keys:
+            self.logger.warning(f'No consent found to save in session state for platform [{self.platform}]')
+            return False
+
+        state = {
+            'saved_at': time.time(),
+            'cookies': cookies,
+            'local_storage': local_storage,
+            'consent_cookies': consent_cookies,
+            'consent_storage_keys': consent_storage_keys,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as handler:
+                json.dump(state, handler, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning(f'Failed to save session state {self.state_file}: {str(e)}')
+            return False
+        self.logger.debug(f'Saved session state for platform [{self.platform}] to {self.state_file}')
+        return True
+
+    def _consent_names(self, names, names_before=None):
+        """
+        Select the cookie or local storage names holding the consent.
+
+        Args:
+            names (list[str]): The current cookie or local storage names
+            names_before (list[str], optional): The names before accepting the consent. Defaults to None
+
+        Returns:
+            list[str]: The known consent names present, otherwise the names added since the snapshot
+        """
+        known = sorted(name for name in names if name in self.CONSENT_KEYS)
+        if known or names_before is None:
+            return known
+        return sorted(set(names) - set(names_before))
+
+    def clear(self):
+        """
+        Remove the saved session state of the platform. Failing to remove it is only logged.
+        """
+        try:
+            if os.path.exists(self.state_file):
+                os.remove(self.state_file)
+        except OSError as e:
+            self.logger.warning(f'Failed to remove session state {self.state_file}: {str(e)}')